@@ -4,8 +4,81 @@
 import os
 import re
 import sys
-import argparse
-from collections import defaultdict
+import mmap
+import stat
+import bisect
+import functools
+
+# Precompiled patterns used throughout parsing and hyperlinking
+_TITLE_RE = re.compile(r'\b(sir|lady|lord|count|countess|duke|duchess|baron|baroness|mr|mrs|miss|dr|rev|jr|sr|i|ii|iii|iv|v)\b\.?')
+_WS_RE = re.compile(r'\s+')
+_DATE_PLACE_PREFIXES = ("on ", "in ", "about ", "from ", "at ")
+_UNLINKED_NAMES = ("unknown", "unnamed")
+_YEAR_RE = re.compile(r'\d{4}')
+_LINK_STYLE_PRE = "}{\\textcolor{accent}{\\textbf{\\underline{"
+_LINK_STYLE_POST = "}}}}"
+_MISSING_LINK_PRE = "\\href{#" + _LINK_STYLE_PRE
+
+# Common OCR issues and special characters. Applied with str.replace, which
+# scans for each character in C; str.translate with a dict table is about
+# ten times slower once the text has any non-ASCII character
+_OCR_REPLACEMENTS = (
+    ('\u201c', '"'),   # opening double quote
+    ('\u201d', '"'),   # closing double quote
+    ('\u2019', "'"),   # apostrophe
+    ('\u2013', "-"),   # en dash
+    ('\u2014', "--"),  # em dash
+)
+
+# Entry and section detection
+_ENTRY_ANY_RE = re.compile(r'^(\d{5,})\.\s+(.+)')  # 5-10 digit numbers and large IDs (18138...)
+_ENTRY_NUMBER_RE = re.compile(r'^(\d+)\.')
+_GENERATION_RE = re.compile(r'^\s+(\d+)(?:st|nd|rd|th) Generation\s*$', re.IGNORECASE)
+_ROMAN_NUMERAL_LINE_RE = re.compile(r'^\s+(?:[ivxlcdm]+)\.\s+', re.IGNORECASE)
+_CHILD_ENTRY_LINE_RE = re.compile(r'^\s+(\d{5,10})\s+([ivxlcdm]+)\.\s+(.*)', re.IGNORECASE)
+
+# Entry content parsing
+_MARR_CONT_PREFIXES = (", ", "on ", "in ", "before ", "after ")
+_MARRIAGE_CONT_RE = re.compile(r'^(?:on |in |about |circa |c\. )?(?:\d{1,2}\s+[A-Za-z]+\s+\d{4}|\d{4})')
+_MARRIAGE_DATE_MARKERS = ("on ", "in ", "about ")
+_CHILDREN_MARKER_PREFIXES = ("Children from this marriage", "The child from this marriage")
+
+# Classifies a stripped content line in one match. Alternatives are listed in
+# the order the content loop used to try them, so an ID with a Roman numeral
+# still wins over the looser numbered format
+_CONTENT_LINE_RE = re.compile(
+    r'(?P<entry>\d{5,}\.\s+.+)'
+    r'|(?P<children_marker>(?:(?:The )?[Cc]hild(?:ren)?|(?:The )?[Cc]hildren|The following child(?:ren)?) (?:from|of) this marriage)'
+    r'|(?P<his_her>(?:His|Her) child(?:ren)? (?:was|were):)'
+    r'|(?P<id_roman>(?P<id_number>\d{5,10})\s+(?i:[ivxlcdm]+)\.\s+(?P<id_text>.*))'
+    r'|(?P<roman>(?P<numeral>(?i:[ivxlcdm]+))\.\s+(?:(?P<roman_number>\d+)\s+)?(?P<roman_text>.*))'
+    r'|(?P<number_format>\(?(?P<format_number>\d+)\)?\s+(?i:[ivxlcdm]+)\.?\s+(?P<format_text>.*))'
+)
+
+# Bio and marriage formatting
+# An angle-bracketed URL is taken whole so the bare alternative never sees the
+# URL again inside the \url{} it was just wrapped in
+_URL_RE = re.compile(r'<(https?://[^>]+)>|(https?://\S+)')
+# The "X and Y" form is tried first at each position; group names match the
+# _BLOCK_PARENT_* patterns so all are rewritten by _fixup_links
+_PARENT_REF_RE = re.compile(
+    r'(?P<parents2>\b(?P<relation2>son|daughter) of (?P<parent_a>[^.,;()]+) and (?P<parent_b>[^.,;()]+?)(?=[.,;()]|$))'
+    r'|(?P<parents1>\b(?P<relation1>son|daughter) of (?P<parent>[^.,;()]+?)(?=[.,;()]|$))'
+)
+_MARRIAGE_DATE_RE = re.compile(r'(married [^.,;]+) (on|about|in) ([^.,;]+)')
+_ON_IN_ABOUT_RE = re.compile(r'(on|in|about)')
+
+# Block fixups. Kept as separate subs so each keeps sre's literal prefix search
+_BLOCK_PARENT_PAIR_RE = re.compile(r'(?P<parents2>\b(?P<relation2>son|daughter) of (?P<parent_a>[A-Z][^.,;]+?) and (?P<parent_b>[A-Z][^.,;]+?)(?=[.,;)]|\\))')
+# The lookbehind keeps the single form off the "X and " that the pair sub
+# leaves in front of a link when X itself is not linked (e.g. "Unknown")
+_BLOCK_PARENT_SINGLE_RE = re.compile(r'(?P<parents1>\b(?P<relation1>son|daughter) of (?P<parent>[A-Z][^.,;]+?)(?=[.,;)]|\\)(?<! and ))')
+_BLOCK_MARRIAGE_RE = re.compile(r'\\marriage{([^}]+)}\.?')
+_BLOCK_URL_ANGLE_RE = re.compile(r'<(https?://[^>]+)>')
+_BLOCK_URL_BARE_RE = re.compile(r'(?<!\\url\{)(https?://\S+)(?!\})')
+
+# Marks a name missing from PersonRegistry._match_cache, which also stores None
+_NOT_CACHED = object()
 
 class PersonRegistry:
     """A registry to keep track of person references and IDs."""
@@ -14,10 +87,27 @@ class PersonRegistry:
         """Initialize an empty registry."""
         self.id_map = {}  # Maps normalized names to IDs
         self.name_map = {}  # Maps IDs to original names
+        self._names = []  # Normalized names in registration order
+        self._name_index = {}  # Maps normalized names to their registration order
+        self._offsets = []  # Start offset of each normalized name in the haystack
+        self._haystack_end = 0
+        self._haystack = None  # Normalized names joined by newlines, rebuilt lazily
+        self._names_by_length = {}  # Maps name lengths to sets of normalized names
+        self._match_cache = {}  # Maps looked-up names to their partial match
     
     def register_person(self, person_id, name):
         """Register a person with their ID and name."""
+        person_id = sys.intern(person_id)
         norm_name = self._normalize_name(name)
+        if norm_name not in self.id_map:
+            # A new name can change the result of any partial match
+            self._name_index[norm_name] = len(self._names)
+            self._names.append(norm_name)
+            self._offsets.append(self._haystack_end)
+            self._haystack_end += len(norm_name) + 1
+            self._haystack = None
+            self._names_by_length.setdefault(len(norm_name), set()).add(norm_name)
+            self._match_cache.clear()
         self.id_map[norm_name] = person_id
         self.name_map[person_id] = name
     
@@ -26,24 +116,62 @@ class PersonRegistry:
         norm_name = self._normalize_name(name)
         
         # Try direct match
-        if norm_name in self.id_map:
-            return self.id_map[norm_name]
+        person_id = self.id_map.get(norm_name)
+        if person_id is not None:
+            return person_id
         
         # Try partial match (for names that might be incomplete)
-        for reg_name, reg_id in self.id_map.items():
-            if norm_name in reg_name or reg_name in norm_name:
-                return reg_id
+        reg_name = self._match_cache.get(norm_name, _NOT_CACHED)
+        if reg_name is _NOT_CACHED:
+            reg_name = self._find_partial_match(norm_name)
+            self._match_cache[norm_name] = reg_name
+        
+        if reg_name is not None:
+            return self.id_map[reg_name]
                 
         # No match found
         return None
     
-    def _normalize_name(self, name):
+    def _find_partial_match(self, norm_name):
+        """Find the earliest registered name that contains or is contained in norm_name."""
+        if not self._names:
+            return None
+        
+        if self._haystack is None:
+            self._haystack = "\n".join(self._names)
+        
+        # Registered names containing the lookup: the first hit in the haystack
+        # belongs to the earliest such name since normalized names have no newlines
+        best = None
+        pos = self._haystack.find(norm_name)
+        if pos != -1:
+            best = bisect.bisect_right(self._offsets, pos) - 1
+        
+        # Registered names contained in the lookup: check its substrings of each
+        # registered length
+        name_length = len(norm_name)
+        for length, reg_names in self._names_by_length.items():
+            if length > name_length:
+                continue
+            for start in range(name_length - length + 1):
+                reg_name = norm_name[start:start + length]
+                if reg_name in reg_names:
+                    index = self._name_index[reg_name]
+                    if best is None or index < best:
+                        best = index
+        
+        return self._names[best] if best is not None else None
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _normalize_name(name):
         """Normalize a name for consistent matching."""
         # Convert to lowercase and remove excess spaces
         name = name.lower().strip()
         # Remove titles and suffixes for better matching
-        name = re.sub(r'\b(sir|lady|lord|count|countess|duke|duchess|baron|baroness|mr|mrs|miss|dr|rev|jr|sr|i|ii|iii|iv|v)\b\.?', '', name)
-        return ' '.join(name.split())
+        name = _TITLE_RE.sub('', name)
+        # Interned so registry lookups can short-circuit on identity
+        return sys.intern(_WS_RE.sub(' ', name).strip())
 
 # Initialize the global person registry
 person_registry = PersonRegistry()
@@ -59,13 +187,19 @@ def hyperlink(name):
     
     # Remove period at the end if present
     if name.endswith('.'):
-        name = name[:-1]
-        add_period = True
-    else:
-        add_period = False
-    
+        return _hyperlink_cached(name[:-1], True)
+    return _hyperlink_cached(name, False)
+
+
+@functools.lru_cache(maxsize=None)
+def _hyperlink_cached(name, add_period):
+    """Build the hyperlink for a stripped name; cleared whenever the registry changes.
+
+    The registry is complete before any block is formatted, so the cache is
+    left unbounded and keeps every name seen in a run.
+    """
     # Check for special cases
-    if name.lower() in ["unknown", "unnamed"]:
+    if name.lower() in _UNLINKED_NAMES:
         return name + ('.' if add_period else '')
     
     # If the name already contains hyperlink commands, don't add another one
@@ -73,7 +207,7 @@ def hyperlink(name):
         return name + ('.' if add_period else '')
     
     # Detect if the text looks like a date or place rather than a name
-    if re.match(r'^(on|in|about|from|at) ', name) or re.search(r'\d{4}', name):
+    if name.startswith(_DATE_PLACE_PREFIXES) or _YEAR_RE.search(name):
         return name + ('.' if add_period else '')
     
     # Look for a person ID
@@ -81,10 +215,10 @@ def hyperlink(name):
     
     if person_id:
         # Create a hyperlink to the person's entry using hyperlink command with bold and underline
-        result = "\\hyperlink{person" + str(person_id) + "}{\\textcolor{accent}{\\textbf{\\underline{" + name + "}}}}"
+        result = "\\hyperlink{person" + person_id + _LINK_STYLE_PRE + name + _LINK_STYLE_POST
     else:
         # For unlinked names, use href with # to indicate it's a missing link
-        result = "\\href{#}{\\textcolor{accent}{\\textbf{\\underline{" + name + "}}}}"
+        result = _MISSING_LINK_PRE + name + _LINK_STYLE_POST
     
     # Add period back if needed
     if add_period:
@@ -93,21 +227,37 @@ def hyperlink(name):
     return result
 
 
+_ROMAN_SYMBOLS = ((1000, 'm'), (900, 'cm'), (500, 'd'), (400, 'cd'),
+                  (100, 'c'), (90, 'xc'), (50, 'l'), (40, 'xl'),
+                  (10, 'x'), (9, 'ix'), (5, 'v'), (4, 'iv'), (1, 'i'))
+
+def _to_roman(number):
+    """Convert a positive integer to a lowercase Roman numeral."""
+    numerals = []
+    for value, symbol in _ROMAN_SYMBOLS:
+        if number >= value:
+            count, number = divmod(number, value)
+            numerals.append(symbol * count)
+    return "".join(numerals)
+
+# Roman numerals for child entries, precomputed for the common family sizes
+_ROMANS = tuple(_to_roman(i) for i in range(1, 51))
+
 
 def format_person_block(entry_number, name, bio, marriage, children, generation=None):
     """Format a single LaTeX person block."""
     # Add generation title if provided
-    block = ""
+    block_parts = []
     if generation:
-        block += f"\\generationtitle{{{generation}}}\n"
+        block_parts.append(f"\\generationtitle{{{generation}}}\n")
     
     # Split bio into parts if needed for better formatting
     bio_parts = []
     if len(bio) > 300:
         # Split at a reasonable point (after a sentence or at a comma)
-        split_point = bio[:300].rfind(". ")
+        split_point = bio.rfind(". ", 0, 300)
         if split_point == -1:
-            split_point = bio[:300].rfind(", ")
+            split_point = bio.rfind(", ", 0, 300)
         
         if split_point != -1:
             bio_parts.append(bio[:split_point+1])
@@ -132,14 +282,14 @@ def format_person_block(entry_number, name, bio, marriage, children, generation=
     # Create the main entry with proper ID and only the name part bolded
     if len(bio_parts) == 1:
         if rest_of_name:
-            block += f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}, {rest_of_name}}}{{{bio_parts[0]}}}\n"
+            block_parts.append(f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}, {rest_of_name}}}{{{bio_parts[0]}}}\n")
         else:
-            block += f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}}}{{{bio_parts[0]}}}\n"
+            block_parts.append(f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}}}{{{bio_parts[0]}}}\n")
     else:
         if rest_of_name:
-            block += f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}, {rest_of_name}}}{{{bio_parts[0]}}}{{{bio_parts[1]}}}\n"
+            block_parts.append(f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}, {rest_of_name}}}{{{bio_parts[0]}}}{{{bio_parts[1]}}}\n")
         else:
-            block += f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}}}{{{bio_parts[0]}}}{{{bio_parts[1]}}}\n"
+            block_parts.append(f"\\entry{{{entry_number}}}{{\\textbf{{{actual_name}}}}}{{{bio_parts[0]}}}{{{bio_parts[1]}}}\n")
     
     # Add marriage information if available - ensure it's on a new line with proper formatting
     if marriage:
@@ -152,141 +302,176 @@ def format_person_block(entry_number, name, bio, marriage, children, generation=
         
         # Ensure marriage text doesn't have trailing commas or periods that should be part of the next line
         marriage = marriage.rstrip(',.')
-        block += f"\\marriage{{{marriage}}}\n"
+        block_parts.append(f"\\marriage{{{marriage}}}\n")
     
     # Add children section if there are children - ensure it's on a separate line
     if children:
         # Use proper commands for singular/plural children heading
         if len(children) == 1:
-            block += "\\childrenheadingsingular\n"
+            block_parts.append("\\childrenheadingsingular\n")
         else:
-            block += "\\childrenheadingplural\n"
+            block_parts.append("\\childrenheadingplural\n")
         
-        # Generate Roman numerals for child entries
-        roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x', 
-                         'xi', 'xii', 'xiii', 'xiv', 'xv', 'xvi', 'xvii', 'xviii', 'xix', 'xx']
-        
-        for idx, (child_number, child_name, has_roman, is_linked) in enumerate(children):
-            roman = roman_numerals[min(idx, len(roman_numerals)-1)]
+        # kind is "linked" for numbered children, "roman" for Roman-numeral
+        # children without a number and "plain" for continuation text
+        for idx, (child_number, child_name, kind) in enumerate(children):
+            roman = _ROMANS[idx] if idx < len(_ROMANS) else _to_roman(idx + 1)
             
             # Only use childentrylinked for children with actual reference numbers
-            if is_linked and child_number != "--":
+            if kind == "linked" and child_number != "--":
                 # This is a hyperlinked child with badge
-                block += f"\\childentrylinked{{{child_number}}}{{{roman}}}{{{child_name}}}\n"
+                block_parts.append(f"\\childentrylinked{{{child_number}}}{{{roman}}}{{{child_name}}}\n")
             else:
                 # For children without reference numbers or with descriptions
-                if has_roman:
+                if kind != "plain":
                     # Regular child entry with roman numeral
-                    block += f"\\childentry{{{''}}}{{{roman}}}{{{child_name}}}\n"
+                    block_parts.append(f"\\childentry{{{''}}}{{{roman}}}{{{child_name}}}\n")
                 else:
                     # This is a continuation of a child description, format with plain text
-                    block += f"\\childentryplain{{{child_name}}}{{{roman}}}{{{''}}}\n"
+                    block_parts.append(f"\\childentryplain{{{child_name}}}{{{roman}}}{{{''}}}\n")
     
     # Add divider line after the entry
-    block += "\\dividerline\n"
+    block_parts.append("\\dividerline\n")
     
-    return block
+    return "".join(block_parts)
 
-def parse_genealogy_data(text):
-    """Parse the genealogy data from the text."""
-    # Use the global person registry instead of creating a new one
-    global person_registry
-    person_registry = PersonRegistry()
-    
-    # Clean up some common OCR issues and special characters
-    text = text.replace('\u201c', '"')  # opening double quote
-    text = text.replace('\u201d', '"')  # closing double quote
-    text = text.replace('\u2019', "'")  # apostrophe
-    text = text.replace('\u2013', "-")  # en dash
-    text = text.replace('\u2014', "--") # em dash
-    
-    # Analyze the file to understand its structure
-    lines = text.splitlines()
-    
-    # Various patterns for identifying entry points
-    entry_start_pattern = re.compile(r'^(\d{5,10})\.(\s+)(.+)')  # Updated to match 5-10 digit numbers
-    alt_entry_start_pattern = re.compile(r'^(\d{5,10})\.\s+(.+)')  # Alternative pattern for potential missed entries
-    large_id_entry_pattern = re.compile(r'^(\d{11,})\.(\s+)(.+)')  # Pattern for large ID entries (18138...)
-    generation_pattern = re.compile(r'^\s+(\d+)(?:st|nd|rd|th) Generation\s*$', re.IGNORECASE)
-    roman_numeral_pattern = re.compile(r'^\s+(?:[ivxlcdm]+)\.\s+', re.IGNORECASE)
-    child_entry_pattern = re.compile(r'^\s+(\d{5,10})\s+([ivxlcdm]+)\.\s+(.*)', re.IGNORECASE)
-    
-    # Skip any lines at the start that might be continuation from previous file
-    start_idx = 0
-    for i, line in enumerate(lines):
-        if entry_start_pattern.match(line) or alt_entry_start_pattern.match(line) or large_id_entry_pattern.match(line):
-            start_idx = i
-            break
-    
-    print(f"Starting parsing process...")
-    print(f"Reading {len(lines)} lines of text...")
+def _link_marriage_date(match):
+    """Link the spouse in a "married X on/about/in ..." match of _MARRIAGE_DATE_RE."""
+    return f"married {hyperlink(match.group(1).replace('married ', '').strip())} {match.group(2)} {match.group(3)}"
+
+def _fixup_links(match):
+    """Rewrite one parent reference matched by _PARENT_REF_RE or a _BLOCK_PARENT_* pattern."""
+    if match.lastgroup == 'parents2':
+        return f"{match.group('relation2')} of {hyperlink(match.group('parent_a').strip())} and {hyperlink(match.group('parent_b').strip())}"
+    return f"{match.group('relation1')} of {hyperlink(match.group('parent').strip())}"
+
+def _fix_ocr(text):
+    """Replace the common OCR characters in text."""
+    # None of the replaced characters are ASCII
+    if text.isascii():
+        return text
+    for old, new in _OCR_REPLACEMENTS:
+        text = text.replace(old, new)
+    return text
+
+class _FileLines:
+    """Re-iterable view of an input file's lines, read through mmap one line at a time."""
+    
+    def __init__(self, path, encoding):
+        self.path = path
+        self.encoding = encoding
+        self._lines = None  # Lines of an input that cannot be mapped or re-read
+    
+    def __iter__(self):
+        if self._lines is not None:
+            yield from self._lines
+            return
+        with open(self.path, "rb") as f:
+            file_stat = os.fstat(f.fileno())
+            if not stat.S_ISREG(file_stat.st_mode):
+                # Pipes and other streams can be neither mapped nor read twice,
+                # so read them whole once and keep the lines for later passes
+                text = _fix_ocr(f.read().decode(self.encoding, "ignore"))
+                self._lines = text.splitlines()
+                yield from self._lines
+                return
+            # mmap refuses empty files
+            if file_stat.st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw in iter(mm.readline, b""):
+                    # Split the decoded line the same way str.splitlines would split
+                    # the whole text, keeping blank lines as empty strings
+                    line = _fix_ocr(raw.decode(self.encoding, "ignore"))
+                    yield from line.splitlines() or [""]
+
+
+def _iter_entry_sections(lines):
+    """Yield (entry_lines, generation) for each entry section in the lines."""
+    # Bound once since they run on every input line
+    match_entry = _ENTRY_ANY_RE.match
+    match_generation = _GENERATION_RE.match
     
     # Divide text into entry sections
-    entry_sections = []
     current_entry = []
     in_children_section = False
-    in_generation_header = False
     current_generation = None
+    started = False
     
-    i = start_idx
-    while i < len(lines):
-        line = lines[i].rstrip()
+    for line in lines:
+        # Skip any lines at the start that might be continuation from previous file
+        if not started:
+            if not (line[:1].isdigit() and match_entry(line)):
+                continue
+            started = True
+        
+        # Right-stripped once here, so only leading whitespace is left below
+        line = line.rstrip()
         
-        # Check for generation markers
-        gen_match = generation_pattern.match(line)
-        if gen_match:
-            current_generation = line.strip()
-            in_generation_header = True
-            i += 1
+        # Check for generation markers (always indented)
+        if line[:1].isspace() and match_generation(line):
+            current_generation = line.lstrip()
             continue
         
         # Check if line starts with a number followed by period - indicates main entry
-        # Use all patterns to catch more variations including large IDs
-        match = entry_start_pattern.match(line) or alt_entry_start_pattern.match(line) or large_id_entry_pattern.match(line)
+        match = match_entry(line) if line[:1].isdigit() else None
         
         if match:
             # This is the start of a new entry
             if current_entry:
-                entry_sections.append((current_entry, current_generation))
+                yield current_entry, current_generation
                 current_entry = []
             
-            in_generation_header = False
             in_children_section = False
             current_entry.append(line)
-        elif line.strip().startswith("Children from this marriage") or line.strip().startswith("The child from this marriage"):
+        elif line.lstrip().startswith(_CHILDREN_MARKER_PREFIXES):
             # Mark that we're in a children section
             in_children_section = True
             if current_entry:
                 current_entry.append(line)
-        elif in_children_section and (roman_numeral_pattern.match(line) or child_entry_pattern.match(line)):
+        elif in_children_section and (_ROMAN_NUMERAL_LINE_RE.match(line) or _CHILD_ENTRY_LINE_RE.match(line)):
             # This is a child entry with roman numeral, not a new main entry
             if current_entry:
                 current_entry.append(line)
-        elif line.strip() and (re.match(r'^(\d{5,10})\.\s+(.+)', line) or re.match(r'^(\d{11,})\.\s+(.+)', line)):
-            # This is a new main entry that was missed by our primary pattern
-            # It starts with a digit sequence followed by period and space
-            if current_entry:
-                entry_sections.append((current_entry, current_generation))
-                current_entry = []
-            
-            in_generation_header = False
-            in_children_section = False
-            current_entry.append(line)
         elif current_entry:
             # Continue with the current entry
             current_entry.append(line)
-        
-        i += 1
     
     # Add the last entry if it exists
     if current_entry:
-        entry_sections.append((current_entry, current_generation))
-    
-    print(f"Found {len(entry_sections)} potential entry sections")
-    
-    # Process each entry section
-    person_blocks = []
-    skipped_entries = []
+        yield current_entry, current_generation
+
+
+def _extract_id_name(entry_lines):
+    """Return the (entry_number, name) of an entry section, or None if it has no valid entry line."""
+    match = _ENTRY_ANY_RE.match(entry_lines[0])
+    if not match:
+        return None
+    entry_number, name_part = match.groups()
+    return entry_number.strip(), name_part.strip()
+
+def _iter_entry_ids(lines):
+    """Yield the (entry_number, name) of every entry line without collecting sections."""
+    # Every line that _iter_entry_sections treats as an entry opens a section,
+    # so this sees the same entries in the same order
+    match_entry = _ENTRY_ANY_RE.match
+    for line in lines:
+        if line[:1].isdigit():
+            match = match_entry(line.rstrip())
+            if match:
+                entry_number, name_part = match.groups()
+                yield entry_number.strip(), name_part.strip()
+
+def _iter_person_blocks(entry_sections, skipped_entries):
+    """Yield the LaTeX block of each entry section.
+
+    Every person must already be registered so hyperlinks resolve on the
+    first try. Sections that cannot be processed are appended to
+    skipped_entries.
+    """
+    # Bound once since they run on every content line
+    match_content_line = _CONTENT_LINE_RE.match
+    match_marriage_cont = _MARRIAGE_CONT_RE.match
     
     for entry_lines, generation in entry_sections:
         try:
@@ -295,20 +480,14 @@ def parse_genealogy_data(text):
                 continue
                 
             # First line should contain the entry number and name
-            first_line = entry_lines[0]
-            match = entry_start_pattern.match(first_line) or alt_entry_start_pattern.match(first_line) or large_id_entry_pattern.match(first_line)
+            id_name = _extract_id_name(entry_lines)
             
-            if not match:
+            if not id_name:
                 # Skip this section if it doesn't start with a valid entry pattern
-                skipped_entries.append(("Unknown", first_line[:30] + "...", "Invalid entry format"))
+                skipped_entries.append(("Unknown", entry_lines[0][:30] + "...", "Invalid entry format"))
                 continue
             
-            entry_number, _, name_part = match.groups()
-            entry_number = entry_number.strip()
-            name = name_part.strip()
-            
-            # Join the rest of the lines as content
-            content = "\n".join(entry_lines[1:])
+            entry_number, name = id_name
             
             # Now we'll process this entry's content
             bio_lines = []
@@ -317,41 +496,43 @@ def parse_genealogy_data(text):
             in_children = False
             multiple_marriages = []
             
-            # Process line by line
-            content_lines = content.splitlines()
+            # Process the rest of the lines one by one, each stripped once up front
+            content_lines = [line.strip() for line in entry_lines[1:]]
             i = 0
             child_continuation = False
             current_child = None
             
             while i < len(content_lines):
-                line = content_lines[i].strip()
+                line = content_lines[i]
                 
                 # Skip empty lines
                 if not line:
                     i += 1
                     continue
                 
+                content_match = match_content_line(line)
+                line_kind = content_match.lastgroup if content_match else None
+                
                 # Check for possible new entry pattern (ID with period) and exit if found
-                if entry_start_pattern.match(line):
+                if line_kind == 'entry':
                     # This looks like a new entry starting - don't process here
                     break
                 
-                # Check for children section marker
-                if re.search(r'^(?:(?:The )?[Cc]hild(?:ren)?|(?:The )?[Cc]hildren|The following child(?:ren)?) (?:from|of) this marriage', line):
+                # Check for children section marker, including lines like
+                # "His/Her child was:" or "His/Her children were:"
+                if line_kind == 'children_marker' or line_kind == 'his_her':
                     in_children = True
                     i += 1
                     continue
                 
-                # For lines like "His/Her child was:" or "His/Her children were:"
-                if re.search(r'^(?:His|Her) child(?:ren)? (?:was|were):', line):
-                    in_children = True
-                    i += 1
-                    continue
+                # Lowercased once for all the "married" checks below
+                line_l = line.lower()
                 
                 # Check for marriage line (only before children section)
-                if (" married " in line.lower() or " next married " in line.lower()) and not in_children:
+                # (" next married " contains " married ", so one test covers both)
+                if not in_children and " married " in line_l:
                     # Handle "next married" which indicates a new marriage
-                    if "next married" in line.lower() and marriage:
+                    if "next married" in line_l and marriage:
                         # Store the existing marriage
                         if marriage:
                             multiple_marriages.append(marriage)
@@ -359,16 +540,11 @@ def parse_genealogy_data(text):
                     else:
                         # Check if the next line might be part of the marriage
                         if i + 1 < len(content_lines):
-                            next_line = content_lines[i + 1].strip()
+                            next_line = content_lines[i + 1]
                             # Check for common marriage date/place patterns
                             is_marriage_continuation = (
-                                re.match(r'^(?:on |in |about |circa |c\. )?\d{1,2}\s+[A-Za-z]+\s+\d{4}', next_line) or
-                                re.match(r'^(?:on |in |about |circa |c\. )?\d{4}', next_line) or
-                                next_line.startswith(", ") or
-                                next_line.startswith("on ") or
-                                next_line.startswith("in ") or
-                                next_line.startswith("before ") or
-                                next_line.startswith("after ")
+                                next_line.startswith(_MARR_CONT_PREFIXES) or
+                                match_marriage_cont(next_line)
                             )
                             
                             if is_marriage_continuation:
@@ -383,36 +559,24 @@ def parse_genealogy_data(text):
                 
                 # Process children lines
                 if in_children:
-                    # Reset in_children flag if we encounter what appears to be a new section
-                    if entry_start_pattern.match(line):
-                        # This looks like a new entry number, don't process here
-                        in_children = False
-                        break
-                    
-                    # Check for patterns
-                    roman_match = re.match(r'^([ivxlcdm]+)\.(\s+)(.*)', line, re.IGNORECASE)
-                    id_with_roman_match = re.match(r'^(\d{5,10})\s+([ivxlcdm]+)\.(\s+)(.*)', line, re.IGNORECASE)
-                    
-                    if id_with_roman_match:
+                    if line_kind == 'id_roman':
                         # Child with ID and Roman numeral
-                        cid, roman, space, child_text = id_with_roman_match.groups()
-                        children.append((cid.strip(), hyperlink(child_text.strip()), True, True))
+                        cid, child_text = content_match.group('id_number', 'id_text')
+                        children.append((cid.strip(), hyperlink(child_text.strip()), "linked"))
                         child_continuation = False
                         current_child = None
-                    elif roman_match and len(roman_match.group(1)) <= 6:  # Limit length to avoid false positives
-                        # This is a child entry with a Roman numeral
-                        roman, space, child_text = roman_match.groups()
-                        
-                        # Check for number before name (numeric ID)
-                        number_match = re.match(r'(?:(\d+)\s+)(.*)', child_text)
+                    elif line_kind == 'roman' and len(content_match.group('numeral')) <= 6:  # Limit length to avoid false positives
+                        # This is a child entry with a Roman numeral, captured
+                        # with the numeric ID before the name when there is one
+                        cid, child_text = content_match.group('roman_number', 'roman_text')
+                        ct_l = child_text.lower()
                         
-                        if number_match:
+                        if cid:
                             # Child with a number ID
-                            cid, cname = number_match.groups()
-                            children.append((cid.strip(), hyperlink(cname.strip()), True, True))
+                            children.append((cid, hyperlink(child_text.strip()), "linked"))
                             child_continuation = False
                             current_child = None
-                        elif "next married" in child_text.lower() or ("married" in child_text.lower() and not child_text.lower().startswith(("he", "she"))):
+                        elif "next married" in ct_l or ("married" in ct_l and not ct_l.startswith(("he", "she"))):
                             # This is a marriage line, not a child
                             if marriage:
                                 multiple_marriages.append(marriage)
@@ -421,19 +585,17 @@ def parse_genealogy_data(text):
                             continue
                         else:
                             # Child without number ID but still hyperlink the name
-                            children.append(("--", hyperlink(child_text.strip()), True, False))
+                            children.append(("--", hyperlink(child_text.strip()), "roman"))
                             child_continuation = False
                             current_child = None
                     else:
                         # Special case for alternative formats
-                        number_format = re.match(r'^\(?(\d+)\)?\s+(?:[ivxlcdm]+)\.?\s+(.*)', line, re.IGNORECASE)
-                        
-                        if number_format:
-                            cid, cname = number_format.groups()
-                            children.append((cid.strip(), hyperlink(cname.strip()), True, True))
+                        if line_kind == 'number_format':
+                            cid, cname = content_match.group('format_number', 'format_text')
+                            children.append((cid.strip(), hyperlink(cname.strip()), "linked"))
                             child_continuation = False
                             current_child = None
-                        elif "next married" in line.lower():
+                        elif "next married" in line_l:
                             # This is a new marriage, store the existing one
                             if marriage:
                                 multiple_marriages.append(marriage)
@@ -445,14 +607,14 @@ def parse_genealogy_data(text):
                             # This is likely a continuation line for a child description
                             if not child_continuation:
                                 # Start a new continuation child
-                                children.append(("--", line.strip(), False, False))
+                                children.append(("--", line, "plain"))
                                 child_continuation = True
                                 current_child = len(children) - 1
                             else:
                                 # Append to the existing continuation child
                                 if current_child is not None and current_child < len(children):
                                     old_text = children[current_child][1]
-                                    children[current_child] = (children[current_child][0], old_text + " " + line.strip(), False, False)
+                                    children[current_child] = (children[current_child][0], old_text + " " + line, "plain")
                         else:
                             # Not a proper child format, add to bio
                             bio_lines.append(line)
@@ -467,26 +629,14 @@ def parse_genealogy_data(text):
             # Join bio lines with spaces, ensuring proper spacing
             bio = " ".join(bio_lines).strip()
             
-            # Format URLs in bio and marriage text
-            bio = re.sub(r'<(https?://[^>]+)>', r'\\url{\1}', bio)
-            bio = re.sub(r'(https?://\S+)', r'\\url{\1}', bio)
+            # Format URLs in bio and marriage text; both patterns need "http"
+            if "http" in bio:
+                bio = _URL_RE.sub(r'\\url{\1\2}', bio)
             
-            # Enhanced pattern for parent references in bio
-            # First, try a more complete pattern for "son/daughter of X and Y"
-            parent_pattern = re.compile(r'\b(son|daughter) of ([^.,;()]+) and ([^.,;()]+?)(?=[.,;()]|$)')
-            bio_with_parents = parent_pattern.sub(
-                lambda m: f"{m.group(1)} of {hyperlink(m.group(2).strip())} and {hyperlink(m.group(3).strip())}",
-                bio
-            )
-            
-            # Handle single parent references
-            single_parent_pattern = re.compile(r'\b(son|daughter) of ([^.,;()]+?)(?=[.,;()]|$)')
-            bio_with_parents = single_parent_pattern.sub(
-                lambda m: f"{m.group(1)} of {hyperlink(m.group(2).strip())}",
-                bio_with_parents
-            )
-            
-            bio = bio_with_parents
+            # Link "son/daughter of X and Y" and single parent references in
+            # bio, which all contain " of "
+            if " of " in bio:
+                bio = _PARENT_REF_RE.sub(_fixup_links, bio)
             
             # Process all marriages
             if multiple_marriages:
@@ -512,123 +662,145 @@ def parse_genealogy_data(text):
             # Format marriage with hyperlinks, ensuring proper spacing
             if marriage:
                 marriage = marriage.strip()
-                marriage = re.sub(r'<(https?://[^>]+)>', r'\\url{\1}', marriage)
-                marriage = re.sub(r'(https?://\S+)', r'\\url{\1}', marriage)
-                
-                # Enhanced pattern for parent references in marriage text
-                marriage = parent_pattern.sub(
-                    lambda m: f"{m.group(1)} of {hyperlink(m.group(2).strip())} and {hyperlink(m.group(3).strip())}",
-                    marriage
-                )
+                if "http" in marriage:
+                    marriage = _URL_RE.sub(r'\\url{\1\2}', marriage)
                 
-                # Handle single parent references
-                marriage = single_parent_pattern.sub(
-                    lambda m: f"{m.group(1)} of {hyperlink(m.group(2).strip())}",
-                    marriage
-                )
+                # Link parent references in marriage text the same way
+                if " of " in marriage:
+                    marriage = _PARENT_REF_RE.sub(_fixup_links, marriage)
                 
                 # Handle the marriage pattern itself
                 # First, try to identify typical marriage patterns with dates
-                marriage_date_pattern = re.compile(r'(married [^.,;]+) (on|about|in) ([^.,;]+)')
-                marriage = marriage_date_pattern.sub(
-                    lambda m: f"married {hyperlink(m.group(1).replace('married ', '').strip())} {m.group(2)} {m.group(3)}",
-                    marriage
-                )
+                if "married " in marriage:
+                    marriage = _MARRIAGE_DATE_RE.sub(_link_marriage_date, marriage)
                 
                 # Then handle the simpler marriage case without dates
-                if " married " in marriage and not marriage_date_pattern.search(marriage):
+                if " married " in marriage and not _MARRIAGE_DATE_RE.search(marriage):
                     parts = marriage.split(" married ", 1)
                     person_name = parts[0].strip()
                     rest = parts[1].strip()
                     
                     # Handle "X married Y" pattern
-                    if ", " in rest and not any(marker in rest.split(", ")[0] for marker in ["on ", "in ", "about "]):
+                    if ", " in rest and not any(marker in rest.split(", ")[0] for marker in _MARRIAGE_DATE_MARKERS):
                         # This might be "Y, son/daughter of Z" or "Y, on date"
                         spouse_part, extra_info = rest.split(", ", 1)
                         
                         # Check if it's a parent reference - already processed above
-                        if not re.match(r'(on|in|about)', extra_info):
+                        if not _ON_IN_ABOUT_RE.match(extra_info):
                             marriage = f"{person_name} married {hyperlink(spouse_part.strip())}, {extra_info.strip()}"
-                    elif not any(marker in rest for marker in ["on ", "in ", "about "]):
+                    elif not any(marker in rest for marker in _MARRIAGE_DATE_MARKERS):
                         # Just a simple "X married Y" with no extra info
                         marriage = f"{person_name} married {hyperlink(rest.strip())}"
                 
                 # Remove any trailing periods or commas before command ends
                 marriage = marriage.rstrip('.,')
             
-            # Register this person
-            person_registry.register_person(entry_number, name)
-            
             # Create formatted block
-            person_blocks.append(format_person_block(
+            block = format_person_block(
                 entry_number, 
                 name, 
                 bio, 
                 marriage, 
                 children, 
                 generation
-            ))
+            )
+            yield _fixup_block(block)
         
         except Exception as e:
             # Log errors but continue processing
             first_line = entry_lines[0] if entry_lines else "Unknown"
-            entry_match = re.match(r'^(\d+)\.', first_line)
+            entry_match = _ENTRY_NUMBER_RE.match(first_line)
             entry_number = entry_match.group(1) if entry_match else "Unknown"
             skipped_entries.append((entry_number, first_line[:30] + "...", f"Error: {str(e)}"))
             print(f"Error processing entry {entry_number}: {str(e)}")
+
+
+def _fixup_block(block):
+    """Apply the block-wide parent reference, marriage and URL fixups to a formatted block."""
+    # Link parent references that might have been missed, such as those in the entry name
+    if " of " in block:
+        block = _BLOCK_PARENT_PAIR_RE.sub(_fixup_links, block)
+        block = _BLOCK_PARENT_SINGLE_RE.sub(_fixup_links, block)
+    
+    # Remove trailing periods on marriage commands. This runs after the link
+    # fixups so it sees the final marriage text
+    if "\\marriage{" in block:
+        block = _BLOCK_MARRIAGE_RE.sub(r'\\marriage{\1}', block)
+    
+    # Make sure URLs use \url
+    if "http" in block:
+        block = _BLOCK_URL_ANGLE_RE.sub(r'\\url{\1}', block)
+        block = _BLOCK_URL_BARE_RE.sub(r'\\url{\1}', block)
+    return block
+
+def parse_genealogy_data(text=None, path=None, encoding="windows-1252"):
+    """Parse the genealogy data from the text, yielding one LaTeX block per entry.
+    
+    Pass either the whole input as ``text`` or a ``path`` to read it from; a path
+    is streamed line by line instead of being held in memory.
+    """
+    # Checked here rather than in the generator so a bad call fails immediately
+    if (text is None) == (path is None):
+        raise TypeError("parse_genealogy_data() takes exactly one of text or path")
+    return _parse_genealogy_data(text, path, encoding)
+
+def _parse_genealogy_data(text, path, encoding):
+    # Use the global person registry instead of creating a new one
+    global person_registry
+    person_registry = PersonRegistry()
+    _hyperlink_cached.cache_clear()
     
-    # Second pass to ensure all hyperlinks are properly generated now that all entries are registered
-    final_blocks = []
-    for block in person_blocks:
-        # Re-process hyperlinks in the block now that all entries are registered
-        # Match both href and hyperlink patterns that need to be reprocessed
-        block = re.sub(
-            r'\\href{#}{\\textcolor{accent}{\\textbf{\\underline{([^}]+)}}}',
-            lambda m: hyperlink(m.group(1)),
-            block
-        )
-        block = re.sub(
-            r'\\hyperlink{person}{\\textcolor{accent}{\\textbf{\\underline{([^}]+)}}}',
-            lambda m: hyperlink(m.group(1)),
-            block
-        )
-        
-        # Fix the parent references that might have been missed
-        block = re.sub(
-            r'\b(son|daughter) of ([A-Z][^.,;]+?) and ([A-Z][^.,;]+?)(?=[.,;)]|\\)',
-            lambda m: f"{m.group(1)} of {hyperlink(m.group(2).strip())} and {hyperlink(m.group(3).strip())}",
-            block
-        )
-        
-        # Fix single parent references
-        block = re.sub(
-            r'\b(son|daughter) of ([A-Z][^.,;]+?)(?=[.,;)]|\\)',
-            lambda m: f"{m.group(1)} of {hyperlink(m.group(2).strip())}",
-            block
-        )
-        
-        # Remove trailing periods on marriage commands
-        block = re.sub(
-            r'\\marriage{([^}]+)}\.?',
-            r'\\marriage{\1}',
-            block
-        )
-        
-        # Fix URLs in blocks to ensure they use \url command
-        block = re.sub(r'<(https?://[^>]+)>', r'\\url{\1}', block)
-        block = re.sub(r'(?<!\\url\{)(https?://\S+)(?!\})', r'\\url{\1}', block)
+    print(f"Starting parsing process...")
+    
+    if path is not None:
+        # Clean up common OCR issues line by line as the file is read
+        lines = _FileLines(path, encoding)
+        print(f"Reading lines of text from {path}...")
+    else:
+        # Clean up some common OCR issues and special characters
+        text = _fix_ocr(text)
         
-        final_blocks.append(block)
+        # Analyze the file to understand its structure
+        lines = text.splitlines()
+        print(f"Reading {len(lines)} lines of text...")
     
-    # Write skipped entries to log file
-    with open("skipped_entries.log", "w", encoding="utf-8") as f:
-        for entry_number, name, reason in skipped_entries:
-            f.write(f"Entry {entry_number}: {name} - {reason}\n")
+    # First pass registers every entry so the formatting pass can link to
+    # people that appear later in the file
+    section_count = 0
+    for entry_number, name in _iter_entry_ids(lines):
+        section_count += 1
+        person_registry.register_person(entry_number, name)
+    _hyperlink_cached.cache_clear()
     
-    print(f"Successfully processed {len(person_blocks)} entries")
-    print(f"Skipped {len(skipped_entries)} entries")
+    print(f"Found {section_count} potential entry sections")
     
-    return final_blocks
+    # Second pass formats each entry against the complete registry
+    skipped_entries = []
+    processed = 0
+    for block in _iter_person_blocks(_iter_entry_sections(lines), skipped_entries):
+        processed += 1
+        yield block
+    
+    # Write skipped entries to log file, removing any log left over from a previous run
+    if skipped_entries:
+        with open("skipped_entries.log", "w", encoding="utf-8") as f:
+            f.writelines(f"Entry {entry_number}: {name} - {reason}\n"
+                         for entry_number, name, reason in skipped_entries)
+    elif os.path.exists("skipped_entries.log"):
+        os.remove("skipped_entries.log")
+    
+    print(f"Successfully processed {processed} entries")
+    print(f"Skipped {len(skipped_entries)} entries")
+
+def write_latex(person_blocks, out):
+    """Write person blocks to a file-like object one at a time, returning the entry count."""
+    entry_count = 0
+    for index, block in enumerate(person_blocks):
+        if index:
+            out.write("\n")
+        out.write(block)
+        entry_count += block.count("\\entry{")
+    return entry_count
 
 if __name__ == "__main__":
     try:
@@ -666,25 +838,28 @@ if __name__ == "__main__":
             output_file = "parsed_output.tex"
         
         print(f"Reading {input_file}...")
-        with open(input_file, "r", encoding="windows-1252", errors="ignore") as file:
-            raw_text = file.read()
-        
-        print(f"Read {len(raw_text)} characters from {input_file}")
+        print(f"Input file is {os.path.getsize(input_file)} bytes")
         
-        # Parse the data
+        # Parse the data, streaming the input file rather than reading it whole
         print("Parsing genealogy data...")
-        person_blocks = parse_genealogy_data(raw_text)
+        person_blocks = parse_genealogy_data(path=input_file)
         
-        # Join person blocks into a single string
-        latex_output = "\n".join(person_blocks)
-        
-        # Write the output file
+        # Write each block as it is produced, counting entries along the way.
+        # Parsing happens during the write, so build the output next to the
+        # target and only replace it once every entry has been written
         print(f"Writing to {output_file}...")
-        with open(output_file, "w", encoding="utf-8") as file:
-            file.write(latex_output)
+        temp_file = output_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as file:
+                entry_count = write_latex(person_blocks, file)
+            os.replace(temp_file, output_file)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
         
         print(f"✅ LaTeX generation complete: saved to {output_file}")
-        print(f"Generated {latex_output.count('\\entry{')} entries")
+        print(f"Generated {entry_count} entries")
     
     except Exception as e:
         print(f"❌ Error: {str(e)}")